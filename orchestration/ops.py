@@ -1,13 +1,13 @@
 # S:\AI MAstery\week-7\orchestration\ops.py
 
-from dagster import op
+from dagster import In, Nothing, Out, op
 import subprocess
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-@op
+@op(out=Out(Nothing))
 def scrape_telegram_data(context) -> None: # Added context for logging
     """
     Executes the Telegram scraper script.
@@ -40,12 +40,60 @@ def scrape_telegram_data(context) -> None: # Added context for logging
         context.log.error("Scraper stderr:\n" + (e.stderr if e.stderr else "No stderr from scraper."))
         raise
 
-@op
+@op(out=Out(Nothing))
+def scrape_due_channels(context) -> None:
+    """
+    Executes the Telegram scraper in adaptive mode.
+    Only channels whose learned poll interval has elapsed are scraped, each with its own limit.
+    """
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    scraper_script_path = os.path.join(project_root, "src", "scraper", "main.py")
+
+    context.log.info(f"Calculated project_root: {project_root}")
+    context.log.info(f"Launching adaptive scraper from: {scraper_script_path}")
+
+    try:
+        result = subprocess.run(
+            [sys.executable, scraper_script_path, "--adaptive"],
+            check=True,
+            cwd=project_root,
+            capture_output=True,
+            text=True
+        )
+        context.log.info("✅ Adaptive scraper executed successfully.")
+        if result.stdout:
+            context.log.info("Scraper stdout:\n" + result.stdout)
+        if result.stderr:
+            context.log.warning("Scraper stderr (if any):\n" + result.stderr)
+    except subprocess.CalledProcessError as e:
+        context.log.error("❌ Adaptive scraper failed:")
+        context.log.error(f"Command: {' '.join(e.cmd)}")
+        context.log.error(f"Return Code: {e.returncode}")
+        context.log.error("Scraper stdout:\n" + (e.stdout if e.stdout else "No stdout from scraper."))
+        context.log.error("Scraper stderr:\n" + (e.stderr if e.stderr else "No stderr from scraper."))
+        raise
+
+@op(ins={"start_after": In(Nothing)}, out=Out(Nothing))
 def load_raw_to_postgres(context) -> None:
     """
     Executes the data loading script for PostgreSQL.
     It loads .env variables and passes them to the subprocess.
     """
+    _run_load_script(context, [])
+
+
+@op(ins={"start_after": In(Nothing)}, out=Out(Nothing))
+def load_scraped_files_to_postgres(context) -> None:
+    """
+    Loads only the data lake files the preceding adaptive scrape wrote
+    (metadata/scraped_files.json), so frequent ticks don't reload the whole lake.
+    """
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    manifest_path = os.path.join(project_root, "metadata", "scraped_files.json")
+    _run_load_script(context, ["--manifest", manifest_path])
+
+
+def _run_load_script(context, extra_args) -> None:
     python_executable = sys.executable
     # CORRECTED project_root calculation:
     # This will now be S:\AI MAstery\week-7\telegram-medical-pipeline
@@ -88,7 +136,7 @@ def load_raw_to_postgres(context) -> None:
     try:
         context.log.info("Starting subprocess for load_to_postgres.py...")
         result = subprocess.run(
-            [python_executable, script_path],
+            [python_executable, script_path, *extra_args],
             check=True,          
             cwd=project_root,    # CWD for subprocess is now your actual project root
             capture_output=True, 
@@ -110,7 +158,41 @@ def load_raw_to_postgres(context) -> None:
         raise
 
 
-@op
+@op(ins={"start_after": In(Nothing)}, out=Out(Nothing))
+def run_product_extraction(context) -> None:
+    """
+    Executes the product extraction script.
+    Matches new message text against the product dictionary and writes fct_product_mentions.
+    """
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    extractor_script_path = os.path.join(project_root, "src", "product_extractor", "main.py")
+
+    context.log.info(f"Calculated project_root for product extraction: {project_root}")
+    context.log.info(f"Launching product extraction from: {extractor_script_path}")
+
+    try:
+        result = subprocess.run(
+            [sys.executable, extractor_script_path],
+            check=True,
+            cwd=project_root,
+            capture_output=True,
+            text=True
+        )
+        context.log.info("✅ Product extraction completed successfully.")
+        if result.stdout:
+            context.log.info("Product extraction stdout:\n" + result.stdout)
+        if result.stderr:
+            context.log.warning("Product extraction stderr (if any):\n" + result.stderr)
+    except subprocess.CalledProcessError as e:
+        context.log.error("❌ Product extraction failed:")
+        context.log.error(f"Command: {' '.join(e.cmd)}")
+        context.log.error(f"Return Code: {e.returncode}")
+        context.log.error("Product extraction stdout:\n" + (e.stdout if e.stdout else "No stdout from product extraction."))
+        context.log.error("Product extraction stderr:\n" + (e.stderr if e.stderr else "No stderr from product extraction."))
+        raise
+
+
+@op(ins={"start_after": In(Nothing)})
 def run_dbt_transformations(context) -> None: # Added context for logging
     """
     Runs dbt transformations.
@@ -145,7 +227,7 @@ def run_dbt_transformations(context) -> None: # Added context for logging
         raise
 
 
-@op
+@op(ins={"start_after": In(Nothing)}, out=Out(Nothing))
 def run_yolo_enrichment(context) -> None: # Added context for logging
     """
     Executes the YOLOv8 enrichment script.
@@ -1,22 +1,42 @@
 # \orchestration\pipeline_job.py
 
 
-from dagster import job, ScheduleDefinition
+from dagster import DagsterRunStatus, RunsFilter, job, ScheduleDefinition
 
 # Import all your ops
 from .ops import (
     scrape_telegram_data,
+    scrape_due_channels,
     load_raw_to_postgres,
+    load_scraped_files_to_postgres,
+    run_product_extraction,
     run_dbt_transformations,
     run_yolo_enrichment
 )
 
 @job
 def telegram_pipeline_job():
-    scrape_telegram_data()
-    load_raw_to_postgres()
-    run_dbt_transformations()
-    run_yolo_enrichment()
+    loaded = load_raw_to_postgres(start_after=scrape_telegram_data())
+    # Product extraction and YOLO enrichment read the freshly loaded data, and dbt models their output
+    extracted = run_product_extraction(start_after=loaded)
+    detected = run_yolo_enrichment(start_after=loaded)
+    run_dbt_transformations(start_after=[extracted, detected])
+
+@job
+def adaptive_scrape_job():
+    # Loads only what this tick scraped; the daily job still does a full load
+    load_scraped_files_to_postgres(start_after=scrape_due_channels())
+
+def no_scrape_in_progress(context) -> bool:
+    """Skips an adaptive tick while an earlier tick or the daily run is still going."""
+    in_progress = context.instance.get_runs(
+        filters=RunsFilter(
+            statuses=[DagsterRunStatus.QUEUED, DagsterRunStatus.STARTING, DagsterRunStatus.STARTED],
+        ),
+    )
+    return not any(
+        run.job_name in (telegram_pipeline_job.name, adaptive_scrape_job.name) for run in in_progress
+    )
 
 daily_telegram_schedule = ScheduleDefinition(
     job=telegram_pipeline_job,
@@ -24,4 +44,12 @@ daily_telegram_schedule = ScheduleDefinition(
     name="daily_telegram_pipeline_schedule",
     description="Schedules the Telegram data pipeline to run daily at 1:00 AM UTC (4:00 AM EAT)."
     # REMOVED: timezone="Africa/Addis_Ababa"
-)
\ No newline at end of file
+)
+
+adaptive_scrape_schedule = ScheduleDefinition(
+    job=adaptive_scrape_job,
+    cron_schedule="*/15 * * * *", # Checks every 15 minutes; the scheduler decides which channels are due
+    name="adaptive_scrape_schedule",
+    should_execute=no_scrape_in_progress,
+    description="Scrapes busy channels more often and quiet ones less, within SCRAPE_DAILY_REQUEST_BUDGET."
+)
@@ -3,10 +3,15 @@
 from dagster import Definitions
 
 # Import both the job and the schedule that you defined in pipeline_job.py
-from orchestration.pipeline_job import telegram_pipeline_job, daily_telegram_schedule
+from orchestration.pipeline_job import (
+    telegram_pipeline_job,
+    daily_telegram_schedule,
+    adaptive_scrape_job,
+    adaptive_scrape_schedule,
+)
 
 # Use the Definitions object to group your jobs and schedules
 defs = Definitions(
-    jobs=[telegram_pipeline_job],      # List all your jobs here
-    schedules=[daily_telegram_schedule], # List all your schedules here
+    jobs=[telegram_pipeline_job, adaptive_scrape_job],            # List all your jobs here
+    schedules=[daily_telegram_schedule, adaptive_scrape_schedule], # List all your schedules here
 )
\ No newline at end of file
@@ -1,10 +1,10 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text
 from src.api import schemas
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
-from typing import Generator, List, Dict
+from typing import Generator, List, Dict, Optional
 from psycopg2.extensions import connection as PGConnection
+from src.settings import get_settings
 
 
 def get_top_channels(db: psycopg2.extensions.connection, limit: int):
@@ -21,6 +21,21 @@ def get_top_channels(db: psycopg2.extensions.connection, limit: int):
         return [{"channel": row[0], "message_count": row[1]} for row in result]
 
 
+def get_top_products(db: psycopg2.extensions.connection, limit: int):
+    with db.cursor() as cursor:
+        query = """
+            -- Posts mentioning the product, not alias hits: a post that names it twice counts once
+            SELECT product_name, COUNT(DISTINCT (channel, message_id)) as mention_count
+            FROM fct_product_mentions
+            GROUP BY product_name
+            ORDER BY mention_count DESC
+            LIMIT %s;
+        """
+        cursor.execute(query, (limit,))
+        result = cursor.fetchall()
+        return [{"product_name": row[0], "mention_count": row[1]} for row in result]
+
+
 def get_channel_activity(db, channel_name: str):
     conn = next(db)
     query = """
@@ -41,6 +56,45 @@ def get_channel_activity(db, channel_name: str):
 
 
 
+def get_detections(db: PGConnection, object_class: Optional[str], channel: Optional[str],
+                   min_confidence: float, limit: int) -> List[Dict]:
+    # Reads the detector's own table, so results don't wait for the next dbt run;
+    # filters hit its (detected_object_class, channel) index
+    query = """
+        SELECT channel, message_id, detected_object_class,
+               confidence_score, image_path
+        FROM public.fct_image_detections
+        WHERE channel IS NOT NULL
+          AND (%(object_class)s IS NULL OR detected_object_class = %(object_class)s)
+          AND (%(channel)s IS NULL OR channel = %(channel)s)
+          AND confidence_score >= %(min_confidence)s
+        ORDER BY confidence_score DESC
+        LIMIT %(limit)s;
+    """
+    params = {
+        "object_class": object_class,
+        "channel": channel,
+        "min_confidence": min_confidence,
+        "limit": limit,
+    }
+    with db.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+
+def get_message_detection_summary(db: PGConnection, channel: str, message_id: int) -> Optional[Dict]:
+    # The summary is a dbt mart, so it lives in dbt's output schema
+    query = sql.SQL("""
+        SELECT channel_key AS channel, message_id, object_count, distinct_class_count,
+               max_confidence, has_person, has_product
+        FROM {}.fct_message_detection_summary
+        WHERE channel_key = %(channel)s AND message_id = %(message_id)s;
+    """).format(sql.Identifier(get_settings().dbt_schema))
+    with db.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(query, {"channel": channel, "message_id": message_id})
+        return cursor.fetchone()
+
+
 def search_messages(db: PGConnection, query: str) -> List[Dict]:
     like_query = f"%{query.lower()}%"
     sql = """
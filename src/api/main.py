@@ -1,6 +1,5 @@
 from fastapi import FastAPI, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from src.api import crud, schemas
 from src.api.database import get_db
 import psycopg2
@@ -18,6 +17,11 @@ def read_top_channels(limit: int = 10, db: psycopg2.extensions.connection = Depe
 
 
 
+@app.get("/api/reports/top-products", response_model=List[schemas.ProductReport])
+def read_top_products(limit: int = 10, db: psycopg2.extensions.connection = Depends(get_db)):
+    return crud.get_top_products(db, limit)
+
+
 @app.get("/api/channels/{channel_name}/activity")
 def read_channel_activity(channel_name: str):
     db = get_db()
@@ -33,6 +37,29 @@ def search_messages(query: str, db=Depends(get_db)):
 
 
 
+@app.get("/api/detections", response_model=List[schemas.DetectionRecord])
+def read_detections(
+    object_class: Optional[str] = None,
+    channel: Optional[str] = None,
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0),
+    limit: int = Query(100, ge=1, le=1000),
+    db=Depends(get_db),
+):
+    return crud.get_detections(db, object_class, channel, min_confidence, limit)
+
+
+@app.get(
+    "/api/channels/{channel_name}/messages/{message_id}/detections",
+    response_model=schemas.MessageDetectionSummary,
+)
+def read_message_detections(channel_name: str, message_id: int, db=Depends(get_db)):
+    summary = crud.get_message_detection_summary(db, channel_name, message_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No processed image for this message")
+    return summary
+
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Telegram Medical Pipeline API"}
@@ -20,4 +20,22 @@ class SearchMessage(BaseModel):
     
 class ProductFrequency(BaseModel):
     product: str
-    frequency: int
\ No newline at end of file
+    frequency: int
+
+
+class DetectionRecord(BaseModel):
+    channel: str
+    message_id: int
+    detected_object_class: str
+    confidence_score: float
+    image_path: Optional[str] = None
+
+
+class MessageDetectionSummary(BaseModel):
+    channel: str
+    message_id: int
+    object_count: int
+    distinct_class_count: int
+    max_confidence: Optional[float] = None
+    has_person: bool
+    has_product: bool
@@ -2,28 +2,56 @@
 # src/load_to_postgres.py
 
 import json
+import argparse
 import psycopg2
+from psycopg2.extras import execute_values
 from pathlib import Path
-from dotenv import load_dotenv
 from loguru import logger
 from typing import Any, Dict, List
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-# Load environment variables
-load_dotenv()
+from src.settings import get_settings
+
+settings = get_settings()
 
 # DB configuration from environment
-DB_CONFIG = {
-    "host": os.getenv("PGHOST"),
-    "port": os.getenv("PGPORT"),
-    "dbname": os.getenv("PGDATABASE"),
-    "user": os.getenv("PGUSER"),
-    "password": os.getenv("PGPASSWORD"),
-}
+DB_CONFIG = settings.db_config
 
 # Raw data path from .env
-DATA_DIR = Path(os.getenv("RAW_DATA_DIR", "data/raw/telegram_messages"))
+DATA_DIR = settings.raw_data_dir
+
+# Telegram message ids are only unique within a channel, so rows are keyed on
+# (channel, id). Tables created with the old single-column key are migrated.
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS telegram_messages (
+        id BIGINT NOT NULL,
+        channel TEXT NOT NULL,
+        date TIMESTAMPTZ,
+        text TEXT,
+        views INTEGER,
+        has_media BOOLEAN,
+        is_image BOOLEAN,
+        image_path TEXT,
+        raw_json JSONB,
+        PRIMARY KEY (channel, id)
+    );
+
+    DO $$
+    DECLARE
+        id_pkey TEXT;
+    BEGIN
+        SELECT conname INTO id_pkey
+        FROM pg_constraint
+        WHERE conrelid = 'telegram_messages'::regclass
+          AND contype = 'p'
+          AND array_length(conkey, 1) = 1;
+        IF id_pkey IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE telegram_messages DROP CONSTRAINT %I', id_pkey);
+            ALTER TABLE telegram_messages ADD PRIMARY KEY (channel, id);
+        END IF;
+    END $$;
+"""
 
 def connect_db() -> psycopg2.extensions.connection:
     """Establishes a PostgreSQL connection using environment config."""
@@ -36,6 +64,11 @@ def connect_db() -> psycopg2.extensions.connection:
         logger.error(f"❌ DB connection failed: {e}")
         raise
 
+def ensure_schema(conn: psycopg2.extensions.connection) -> None:
+    """Creates telegram_messages, or moves an existing table to the (channel, id) key."""
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_SQL)
+
 def load_json_file(filepath: Path) -> List[Dict[str, Any]]:
     """Loads a JSON file and returns the list of messages."""
     try:
@@ -52,7 +85,7 @@ def insert_message(cur: psycopg2.extensions.cursor, msg: Dict[str, Any]) -> None
             id, channel, date, text, views,
             has_media, is_image, image_path, raw_json
         ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (id) DO NOTHING;
+        ON CONFLICT (channel, id) DO NOTHING;
     """
     try:
         cur.execute(query, (
@@ -69,9 +102,34 @@ def insert_message(cur: psycopg2.extensions.cursor, msg: Dict[str, Any]) -> None
     except Exception as e:
         logger.error(f"❌ Failed insert for ID {msg.get('id')}: {e}")
 
+def insert_messages(cur: psycopg2.extensions.cursor, msgs: List[Dict[str, Any]]) -> None:
+    """Inserts a batch of messages into telegram_messages in a single statement."""
+    query = """
+        INSERT INTO telegram_messages (
+            id, channel, date, text, views,
+            has_media, is_image, image_path, raw_json
+        ) VALUES %s
+        ON CONFLICT (channel, id) DO NOTHING;
+    """
+    execute_values(cur, query, [
+        (
+            msg.get("id"),
+            msg.get("channel"),
+            msg.get("date"),
+            msg.get("text"),
+            msg.get("views"),
+            msg.get("has_media"),
+            msg.get("is_image"),
+            msg.get("image_path"),
+            json.dumps(msg),
+        )
+        for msg in msgs
+    ])
+
 def load_all_json() -> None:
     """Scans and loads all JSON files into the database."""
     conn = connect_db()
+    ensure_schema(conn)
     cur = conn.cursor()
     count = 0
 
@@ -89,5 +147,38 @@ def load_all_json() -> None:
     conn.close()
     logger.success(f"✅ Loaded {count} messages into PostgreSQL.")
 
+def load_manifest(manifest_path: Path) -> None:
+    """
+    Loads only the files listed in a scrape manifest (a JSON list of paths),
+    one batched insert per file.
+    """
+    files = load_json_file(manifest_path) if manifest_path.exists() else []
+    if not files:
+        logger.info(f"Nothing to load: {manifest_path} lists no files.")
+        return
+
+    conn = connect_db()
+    ensure_schema(conn)
+    count = 0
+    with conn.cursor() as cur:
+        for json_file in files:
+            logger.info(f"📂 Loading {json_file}")
+            messages = load_json_file(Path(json_file))
+            if messages:
+                insert_messages(cur, messages)
+                count += len(messages)
+    conn.close()
+    logger.success(f"✅ Loaded {count} messages from {len(files)} files into PostgreSQL.")
+
 if __name__ == "__main__":
-    load_all_json()
+    parser = argparse.ArgumentParser(description="Load scraped Telegram messages into PostgreSQL.")
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Load only the files listed in this JSON manifest instead of the whole data lake.",
+    )
+    args = parser.parse_args()
+    if args.manifest:
+        load_manifest(args.manifest)
+    else:
+        load_all_json()
@@ -0,0 +1,122 @@
+# src/product_extractor/db.py
+import psycopg2
+from psycopg2.extras import execute_values
+from loguru import logger
+from typing import Dict, Iterator, List, Tuple
+from src.settings import get_settings
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS fct_product_mentions (
+        id BIGSERIAL PRIMARY KEY,
+        message_id BIGINT NOT NULL,
+        channel TEXT NOT NULL,
+        message_date TIMESTAMPTZ,
+        product_name TEXT NOT NULL,
+        matched_text TEXT NOT NULL,
+        dosage_value NUMERIC,
+        dosage_unit TEXT,
+        price_etb NUMERIC,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS idx_product_mentions_product
+        ON fct_product_mentions (product_name);
+    CREATE INDEX IF NOT EXISTS idx_product_mentions_channel_message
+        ON fct_product_mentions (channel, message_id);
+
+    CREATE TABLE IF NOT EXISTS product_extraction_watermarks (
+        channel TEXT PRIMARY KEY,
+        last_message_id BIGINT NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+
+
+def get_db_connection():
+    try:
+        conn = psycopg2.connect(**get_settings().db_config)
+        logger.info("Connected to database")
+        return conn
+    except Exception as e:
+        logger.error(f"DB connection error: {e}")
+        raise
+
+
+def ensure_schema(conn):
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_SQL)
+    conn.commit()
+
+
+def get_watermarks(conn) -> Dict[str, int]:
+    """Highest message id already processed, per channel."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT channel, last_message_id FROM product_extraction_watermarks")
+        return dict(cur.fetchall())
+
+
+def get_channels(conn) -> List[str]:
+    with conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT channel FROM telegram_messages WHERE channel IS NOT NULL")
+        return [row[0] for row in cur.fetchall()]
+
+
+def iter_new_messages(conn, channel: str, after_id: int, batch_size: int) -> Iterator[List[Tuple]]:
+    """
+    Streams messages newer than `after_id` for one channel in batches,
+    using a server-side cursor so large backlogs are never held in memory.
+    The cursor is held across commits so batches can be saved as they finish.
+
+    Yields:
+        Lists of tuples: (id, channel, date, text)
+    """
+    with conn.cursor(name="product_extraction_messages", withhold=True) as cur:
+        cur.itersize = batch_size
+        cur.execute(
+            """
+            SELECT id, channel, date, text
+            FROM telegram_messages
+            WHERE channel = %s AND id > %s
+            ORDER BY id
+            """,
+            (channel, after_id),
+        )
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+
+def save_mentions(conn, channel: str, mentions: List[Tuple], last_message_id: int):
+    """
+    Inserts mentions and advances the channel watermark in one transaction,
+    so a crashed run never skips or double-counts messages.
+    """
+    try:
+        with conn.cursor() as cur:
+            if mentions:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO fct_product_mentions (
+                        message_id, channel, message_date, product_name,
+                        matched_text, dosage_value, dosage_unit, price_etb
+                    ) VALUES %s
+                    """,
+                    mentions,
+                )
+            cur.execute(
+                """
+                INSERT INTO product_extraction_watermarks (channel, last_message_id, updated_at)
+                VALUES (%s, %s, now())
+                ON CONFLICT (channel) DO UPDATE
+                SET last_message_id = EXCLUDED.last_message_id, updated_at = now()
+                """,
+                (channel, last_message_id),
+            )
+        conn.commit()
+        logger.info(f"[{channel}] Saved {len(mentions)} product mentions up to message {last_message_id}")
+    except Exception as e:
+        logger.error(f"[{channel}] Error saving product mentions: {e}")
+        conn.rollback()
+        raise
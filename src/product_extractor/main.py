@@ -0,0 +1,106 @@
+# src/product_extractor/main.py
+
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+from loguru import logger
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from db import ensure_schema, get_channels, get_db_connection, get_watermarks, iter_new_messages, save_mentions
+from matcher import ProductMatcher
+from normalize import dosage_after, price_on_line
+from src.settings import get_settings
+
+settings = get_settings()
+DICTIONARY_PATH = settings.product_dictionary_path
+BATCH_SIZE = settings.product_extraction_batch_size
+WORKERS = settings.product_extraction_workers
+
+# Built once per worker process by _init_worker, never pickled per batch.
+_matcher: Optional[ProductMatcher] = None
+
+
+def _init_worker(dictionary_path: str):
+    global _matcher
+    _matcher = ProductMatcher.from_file(Path(dictionary_path))
+
+
+def extract_batch(rows: List[Tuple]) -> List[Tuple]:
+    """
+    Runs the matcher over a batch of (id, channel, date, text) rows.
+
+    Returns:
+        Rows ready for fct_product_mentions:
+        (message_id, channel, message_date, product_name, matched_text,
+         dosage_value, dosage_unit, price_etb)
+    """
+    mentions = []
+    for message_id, channel, date, text in rows:
+        for start, end, product in _matcher.find_all(text):
+            dosage = dosage_after(text, end)
+            mentions.append((
+                message_id,
+                channel,
+                date,
+                product,
+                text[start:end],
+                dosage[0] if dosage else None,
+                dosage[1] if dosage else None,
+                price_on_line(text, start),
+            ))
+    return mentions
+
+
+def extract_channel(conn, pool: ProcessPoolExecutor, channel: str, after_id: int) -> int:
+    """
+    Extracts mentions from the channel's unprocessed messages. Batches are
+    matched in parallel but saved in order, so the watermark only ever
+    advances past messages whose mentions are already committed.
+    """
+    in_flight = deque()
+    total = 0
+
+    def save_oldest():
+        future, last_id = in_flight.popleft()
+        mentions = future.result()
+        save_mentions(conn, channel, mentions, last_id)
+        return len(mentions)
+
+    for rows in iter_new_messages(conn, channel, after_id, BATCH_SIZE):
+        in_flight.append((pool.submit(extract_batch, rows), rows[-1][0]))
+        if len(in_flight) >= WORKERS * 2:
+            total += save_oldest()
+    while in_flight:
+        total += save_oldest()
+    return total
+
+
+def main():
+    logger.info("Starting product extraction")
+    conn = get_db_connection()
+    ensure_schema(conn)
+
+    watermarks = get_watermarks(conn)
+    channels = get_channels(conn)
+    logger.info(f"Extracting products for {len(channels)} channels with {WORKERS} workers")
+
+    total = 0
+    with ProcessPoolExecutor(
+        max_workers=WORKERS,
+        initializer=_init_worker,
+        initargs=(str(DICTIONARY_PATH),),
+    ) as pool:
+        for channel in channels:
+            count = extract_channel(conn, pool, channel, watermarks.get(channel, 0))
+            logger.info(f"[{channel}] Extracted {count} product mentions")
+            total += count
+
+    conn.close()
+    logger.success(f"Product extraction completed: {total} new mentions.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# src/product_extractor/matcher.py
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class ProductMatcher:
+    """
+    Aho-Corasick automaton over a product/drug dictionary.
+
+    The dictionary is compiled once into a trie with failure links, so every
+    message is scanned in a single pass regardless of how many product names
+    and aliases are loaded.
+    """
+
+    def __init__(self, dictionary: Dict[str, str]):
+        """
+        Args:
+            dictionary: mapping of alias (any casing) -> canonical product name
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        for alias, canonical in dictionary.items():
+            self._add(alias.lower().strip(), canonical)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ProductMatcher":
+        """
+        Loads a dictionary file where each line is `canonical|alias|alias...`.
+        Blank lines and lines starting with `#` are ignored.
+        """
+        dictionary: Dict[str, str] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                names = [name.strip() for name in line.split('|') if name.strip()]
+                canonical = names[0].lower()
+                for name in names:
+                    dictionary[name] = canonical
+        return cls(dictionary)
+
+    def _add(self, pattern: str, canonical: str):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(pattern), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._output[nxt].extend(self._output[self._fail[nxt]])
+
+    def find_all(self, text: Optional[str]) -> List[Tuple[int, int, str]]:
+        """
+        Finds whole-word product mentions in `text`.
+
+        Overlapping matches are resolved leftmost-longest, so "vitamin c 1000"
+        yields a single "vitamin c" mention rather than also "vitamin".
+
+        Returns:
+            List of tuples: (start, end, canonical_product_name)
+        """
+        if not text:
+            return []
+        lowered = text.lower()
+        candidates = []
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, canonical in self._output[state]:
+                start, end = index - length + 1, index + 1
+                if _is_word_boundary(lowered, start, end):
+                    candidates.append((start, end, canonical))
+
+        candidates.sort(key=lambda match: (match[0], -(match[1] - match[0])))
+        matches = []
+        last_end = -1
+        for start, end, canonical in candidates:
+            if start >= last_end:
+                matches.append((start, end, canonical))
+                last_end = end
+        return matches
+
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return not before.isalnum() and not after.isalnum()
@@ -0,0 +1,75 @@
+# src/product_extractor/normalize.py
+
+import re
+from typing import Optional, Tuple
+
+# Dosage units normalized to a canonical spelling; mass units are converted to mg.
+DOSAGE_PATTERN = re.compile(
+    r'(?<![\w.])(\d+(?:[.,]\d+)?)\s*(mg|milligrams?|g|grams?|gm|mcg|µg|ug|micrograms?|ml|iu|%)(?!\w)',
+    re.IGNORECASE,
+)
+PRICE_PATTERN = re.compile(
+    r'(?:(?:etb|birr|br)\.?\s*(\d{1,3}(?:[,\s]\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?))'
+    r'|(?:(\d{1,3}(?:[,\s]\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*(?:etb|birr|br|ብር)(?!\w))',
+    re.IGNORECASE,
+)
+
+UNIT_ALIASES = {
+    'mg': 'mg', 'milligram': 'mg', 'milligrams': 'mg',
+    'g': 'g', 'gm': 'g', 'gram': 'g', 'grams': 'g',
+    'mcg': 'mcg', 'µg': 'mcg', 'ug': 'mcg', 'microgram': 'mcg', 'micrograms': 'mcg',
+    'ml': 'ml',
+    'iu': 'iu',
+    '%': '%',
+}
+TO_MG = {'mg': 1.0, 'g': 1000.0, 'mcg': 0.001}
+
+# How far after a product mention a dosage may appear and still belong to it.
+DOSAGE_WINDOW = 24
+
+
+def _to_number(raw: str) -> float:
+    return float(re.sub(r'[,\s]', '', raw))
+
+
+def parse_dosage(text: str) -> Optional[Tuple[float, str]]:
+    """
+    Parses the first dosage in `text`.
+
+    Returns:
+        (value, unit) with mass units converted to mg, or None
+    """
+    match = DOSAGE_PATTERN.search(text)
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', '.'))
+    unit = UNIT_ALIASES[match.group(2).lower()]
+    if unit in TO_MG:
+        return round(value * TO_MG[unit], 4), 'mg'
+    return value, unit
+
+
+def parse_price(text: str) -> Optional[float]:
+    """
+    Parses the first price in `text`, in Ethiopian birr (ETB).
+    """
+    match = PRICE_PATTERN.search(text)
+    if not match:
+        return None
+    try:
+        return _to_number(match.group(1) or match.group(2))
+    except ValueError:
+        return None
+
+
+def dosage_after(text: str, end: int) -> Optional[Tuple[float, str]]:
+    """Dosage written directly after a product mention, e.g. "Amoxicillin 500mg"."""
+    return parse_dosage(text[end:end + DOSAGE_WINDOW])
+
+
+def price_on_line(text: str, start: int) -> Optional[float]:
+    """Price on the same line as a product mention; channels post one product per line."""
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', start)
+    line = text[line_start:line_end if line_end != -1 else len(text)]
+    return parse_price(line)
@@ -0,0 +1,229 @@
+# src/scraper/adaptive_scheduler.py
+
+import os
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+from loguru import logger
+
+# Telegram returns at most 100 messages per GetHistory request
+PAGE_SIZE = 100
+MIN_RATE_PER_HOUR = 0.01
+MIN_LIMIT = 100
+MAX_LIMIT = 5000
+HISTORY_DAYS = 14
+# Weight of the newest observation in the posting-rate moving average
+EWMA_ALPHA = 0.3
+
+
+class AdaptiveScheduler:
+    """
+    Learns each channel's posting rate and decides how often, and with what
+    page size, to scrape it.
+
+    Rates start from the raw data lake's recent history and are refined with
+    an exponential moving average after every poll. While consecutive polls
+    return nothing, the rate is also capped at 1/H messages per hour, where H
+    is the hours polled without a new message, so dormant channels back off
+    quickly. Poll intervals are then fitted to a global daily request budget
+    (see `plan`).
+    """
+
+    def __init__(self, channels: List[str], metadata_path: Path, messages_dir: Path,
+                 daily_request_budget: int = 2000, min_interval_minutes: int = 15,
+                 max_interval_hours: int = 24):
+        self.channels = channels
+        self.messages_dir = messages_dir
+        self.daily_request_budget = daily_request_budget
+        self.min_interval = timedelta(minutes=min_interval_minutes)
+        self.max_interval = timedelta(hours=max_interval_hours)
+
+        self.state_file = metadata_path / "channel_schedule.json"
+        self.report_file = metadata_path / "schedule_report.json"
+        self.state: Dict[str, Dict] = self._load_json(self.state_file)
+        for channel in channels:
+            if channel not in self.state:
+                self.state[channel] = {
+                    'rate_per_hour': self._history_rate(channel),
+                    'last_polled_at': None,
+                    'silent_since': None,
+                    'polls': 0,
+                }
+
+    @staticmethod
+    def _load_json(path: Path) -> Dict:
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load {path}: {e}")
+            return {}
+
+    def save(self):
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _history_rate(self, channel: str) -> float:
+        """Messages per hour over (up to) the last HISTORY_DAYS days of the raw data lake."""
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(days=HISTORY_DAYS)
+        oldest = now
+        message_ids = set()
+        for json_file in self.messages_dir.glob(f"*/{channel}*.json"):
+            if json_file.stem != channel and not json_file.stem.startswith(f"{channel}_stream_"):
+                continue  # another channel sharing the name prefix
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    messages = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable history file {json_file}: {e}")
+                continue
+            for msg in messages:
+                date = datetime.fromisoformat(msg['date']) if msg.get('date') else None
+                if date and date >= since:
+                    message_ids.add(msg['id'])
+                    oldest = min(oldest, date)
+        # Average over the span the lake actually covers, so a channel added
+        # last week isn't diluted over the full window
+        hours = max(24.0, (now - oldest).total_seconds() / 3600)
+        return max(MIN_RATE_PER_HOUR, len(message_ids) / hours)
+
+    def rate(self, channel: str) -> float:
+        """Learned posting rate in messages per hour."""
+        return max(MIN_RATE_PER_HOUR, self.state[channel]['rate_per_hour'])
+
+    def observe(self, channel: str, new_messages: int, limit: int):
+        """Folds the outcome of a poll into the channel's posting rate."""
+        entry = self.state[channel]
+        now = datetime.now(timezone.utc)
+        silent_since = None
+        if entry['last_polled_at']:
+            if new_messages == 0:
+                # Start of the current run of empty polls
+                silent_since = entry.get('silent_since') or entry['last_polled_at']
+            elapsed_hours = (now - datetime.fromisoformat(entry['last_polled_at'])).total_seconds() / 3600
+            if elapsed_hours >= 1 / 60:  # back-to-back polls say nothing about the rate
+                observed = new_messages / elapsed_hours
+                rate = EWMA_ALPHA * observed + (1 - EWMA_ALPHA) * entry['rate_per_hour']
+                if new_messages >= limit:
+                    # The poll was truncated, so the true rate is at least this high
+                    rate = max(rate, observed * 1.5)
+                if silent_since:
+                    silent_hours = (now - datetime.fromisoformat(silent_since)).total_seconds() / 3600
+                    if silent_hours > 1:
+                        rate = min(rate, 1 / silent_hours)
+                entry['rate_per_hour'] = max(MIN_RATE_PER_HOUR, rate)
+        entry['silent_since'] = silent_since
+        entry['last_polled_at'] = now.isoformat()
+        entry['polls'] += 1
+
+    def _requests_per_day(self, rate: float, interval: timedelta) -> float:
+        hours = interval.total_seconds() / 3600
+        pages_per_poll = max(1, math.ceil(rate * hours / PAGE_SIZE))
+        return (24 / hours) * pages_per_poll
+
+    def _intervals(self, rates: Dict[str, float], k: float) -> Dict[str, timedelta]:
+        intervals = {}
+        for channel, rate in rates.items():
+            # Never poll more often than one expected message per poll
+            shortest = max(self.min_interval, timedelta(hours=1 / rate))
+            interval = timedelta(hours=k / math.sqrt(rate))
+            intervals[channel] = min(self.max_interval, max(shortest, interval))
+        return intervals
+
+    def _total_requests(self, rates: Dict[str, float], intervals: Dict[str, timedelta]) -> float:
+        return sum(self._requests_per_day(rates[c], intervals[c]) for c in rates)
+
+    def plan(self) -> Dict[str, Dict]:
+        """
+        Poll interval and message limit per channel, fitted to the request budget.
+
+        Intervals are proportional to 1/sqrt(rate), which minimises the average
+        age of unscraped messages for a fixed number of polls: busy channels
+        are polled more often, quiet ones back off. The scale factor is the
+        smallest one whose plan fits the daily request budget.
+
+        Returns:
+            Dict of channel -> {rate_per_hour, interval, limit, requests_per_day}
+        """
+        rates = {channel: self.rate(channel) for channel in self.channels}
+
+        low, high = 1e-3, 1e4
+        if self._total_requests(rates, self._intervals(rates, high)) > self.daily_request_budget:
+            logger.warning(
+                f"Daily request budget of {self.daily_request_budget} is too small even "
+                f"at the maximum poll interval; scheduling every channel at the maximum"
+            )
+            low = high
+        for _ in range(60):
+            if high - low < 1e-3:
+                break
+            mid = (low + high) / 2
+            if self._total_requests(rates, self._intervals(rates, mid)) <= self.daily_request_budget:
+                high = mid
+            else:
+                low = mid
+        intervals = self._intervals(rates, high)
+
+        plan = {}
+        for channel in self.channels:
+            rate, interval = rates[channel], intervals[channel]
+            expected = rate * interval.total_seconds() / 3600
+            # Twice the expected volume absorbs bursts without overflowing the limit
+            limit = min(MAX_LIMIT, max(MIN_LIMIT, math.ceil(expected * 2 / PAGE_SIZE) * PAGE_SIZE))
+            plan[channel] = {
+                'rate_per_hour': rate,
+                'interval': interval,
+                'limit': limit,
+                'requests_per_day': self._requests_per_day(rate, interval),
+            }
+        return plan
+
+    def due_channels(self) -> List[Tuple[str, int]]:
+        """
+        Channels whose poll interval has elapsed, busiest first.
+
+        Returns:
+            List of tuples: (channel, message_limit)
+        """
+        now = datetime.now(timezone.utc)
+        due = []
+        for channel, entry in self.plan().items():
+            last_polled = self.state[channel]['last_polled_at']
+            if not last_polled or now - datetime.fromisoformat(last_polled) >= entry['interval']:
+                due.append((channel, entry['limit'], entry['rate_per_hour']))
+        due.sort(key=lambda item: item[2], reverse=True)
+        return [(channel, limit) for channel, limit, _ in due]
+
+    def report(self) -> List[Dict]:
+        """
+        Expected freshness per channel under the current plan. On average the
+        newest unscraped message is half an interval old and at worst a full
+        interval; `overflow_risk` flags channels likely to exceed their limit.
+        """
+        now = datetime.now(timezone.utc)
+        rows = []
+        for channel, entry in self.plan().items():
+            interval_hours = entry['interval'].total_seconds() / 3600
+            last_polled = self.state[channel]['last_polled_at']
+            next_due = (datetime.fromisoformat(last_polled) + entry['interval']) if last_polled else now
+            rows.append({
+                'channel': channel,
+                'rate_per_hour': round(entry['rate_per_hour'], 3),
+                'interval_hours': round(interval_hours, 2),
+                'limit': entry['limit'],
+                'requests_per_day': round(entry['requests_per_day'], 1),
+                'expected_staleness_hours': round(interval_hours / 2, 2),
+                'worst_case_staleness_hours': round(interval_hours, 2),
+                'next_due_at': max(next_due, now).isoformat(),
+                'overflow_risk': entry['rate_per_hour'] * interval_hours > entry['limit'],
+            })
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+        return rows
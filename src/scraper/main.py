@@ -1,15 +1,57 @@
 # src/main.py
+import argparse
 import asyncio
-from telegram_scraper import TelegramScraper
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from telegram_scraper import TelegramScraper, build_scheduler
+
+def print_schedule_report(rows):
+    header = f"{'channel':<24}{'msgs/h':>9}{'interval h':>12}{'limit':>7}{'req/day':>9}{'avg lag h':>11}{'max lag h':>11}  next due"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        flag = "  (may overflow limit)" if row['overflow_risk'] else ""
+        print(
+            f"{row['channel']:<24}{row['rate_per_hour']:>9}{row['interval_hours']:>12}{row['limit']:>7}"
+            f"{row['requests_per_day']:>9}{row['expected_staleness_hours']:>11}"
+            f"{row['worst_case_staleness_hours']:>11}  {row['next_due_at']}{flag}"
+        )
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape Telegram channels.")
+    parser.add_argument(
+        "--listen",
+        action="store_true",
+        help="Run as a long-lived listener that streams new messages into Postgres.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Scrape only the channels the adaptive scheduler says are due.",
+    )
+    parser.add_argument(
+        "--schedule-report",
+        action="store_true",
+        help="Print the adaptive schedule and expected freshness per channel, then exit.",
+    )
+    args = parser.parse_args()
+
     if sys.platform == "win32":
         # Fix event loop policy for Windows
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    scraper = TelegramScraper()
-    asyncio.run(scraper.scrape_all())
+    if args.schedule_report:
+        # Reads only the metadata files: no credentials, and no session a running scrape holds
+        print_schedule_report(build_scheduler().report())
+        return
+
+    # The listener runs next to the batch jobs, so it needs its own session files
+    scraper = TelegramScraper(session_prefix="listener_session" if args.listen else "scraper_session")
+    if args.listen:
+        asyncio.run(scraper.listen())
+    elif args.adaptive:
+        asyncio.run(scraper.scrape_due())
+    else:
+        asyncio.run(scraper.scrape_all())
 
 if __name__ == "__main__":
     main()
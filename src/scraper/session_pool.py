@@ -0,0 +1,144 @@
+# src/scraper/session_pool.py
+
+import time
+import asyncio
+import bisect
+import hashlib
+from typing import Dict, List, Optional
+from loguru import logger
+from telethon import TelegramClient
+from src.settings import get_settings
+
+
+class TelegramAccount:
+    """One Telegram account/session and its scraping state."""
+
+    def __init__(self, name: str, api_id: int, api_hash: str, phone: Optional[str],
+                 session_name: str, flood_sleep_threshold: int):
+        self.name = name
+        self.phone = phone
+        self.session_name = session_name
+        self.client = TelegramClient(session_name, api_id, api_hash)
+        # FloodWaits shorter than this are slept through by Telethon; longer ones
+        # raise so the pool can hand the channel to another account.
+        self.client.flood_sleep_threshold = flood_sleep_threshold
+        # One channel at a time per account keeps each within its own limits
+        self.lock = asyncio.Lock()
+        self.cooldown_until: float = 0.0
+        self.channels_scraped: int = 0
+        self.messages_scraped: int = 0
+        self.flood_waits: int = 0
+
+    def is_cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+
+class SessionPool:
+    """
+    Pool of Telegram accounts that channels are spread across.
+
+    Channels are assigned with consistent hashing, so each channel sticks to
+    the same account between runs and adding an account only moves about
+    1/N of the channels. When an account hits a FloodWait it cools down and
+    its channels fail over to the next account clockwise on the ring.
+    """
+
+    def __init__(self, accounts: List[TelegramAccount], virtual_nodes: int = 64):
+        if not accounts:
+            raise ValueError("SessionPool needs at least one Telegram account")
+        self.accounts = accounts
+        self._ring: List[int] = []
+        self._ring_accounts: Dict[int, TelegramAccount] = {}
+        for account in accounts:
+            for i in range(virtual_nodes):
+                point = self._hash(f"{account.name}#{i}")
+                self._ring_accounts[point] = account
+                bisect.insort(self._ring, point)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+    @classmethod
+    def from_env(cls, session_prefix: str = "scraper_session") -> "SessionPool":
+        """
+        Builds the pool from `Settings.telegram_accounts`: the primary account
+        (TELEGRAM_API_ID / TELEGRAM_API_HASH / PHONE) and further accounts from
+        the same variables suffixed _2, _3, ...
+
+        Args:
+            session_prefix: Session file name; processes that run at the same
+                time need different prefixes, as a Telethon session file can
+                only be opened by one process.
+        """
+        settings = get_settings()
+        accounts = [
+            TelegramAccount(
+                name=f"account{index}",
+                api_id=credentials['api_id'],
+                api_hash=credentials['api_hash'],
+                phone=credentials['phone'],
+                session_name=f"{session_prefix}{credentials['suffix']}",
+                flood_sleep_threshold=settings.flood_sleep_threshold,
+            )
+            for index, credentials in enumerate(settings.telegram_accounts, start=1)
+        ]
+        return cls(accounts)
+
+    @property
+    def primary(self) -> TelegramAccount:
+        return self.accounts[0]
+
+    def candidates(self, channel: str) -> List[TelegramAccount]:
+        """All accounts in ring order starting from the channel's owner."""
+        start = bisect.bisect(self._ring, self._hash(channel))
+        ordered: List[TelegramAccount] = []
+        for offset in range(len(self._ring)):
+            account = self._ring_accounts[self._ring[(start + offset) % len(self._ring)]]
+            if account not in ordered:
+                ordered.append(account)
+                if len(ordered) == len(self.accounts):
+                    break
+        return ordered
+
+    def owner(self, channel: str) -> TelegramAccount:
+        return self.candidates(channel)[0]
+
+    def available(self, channel: str) -> Optional[TelegramAccount]:
+        """First account for the channel that is not cooling down, if any."""
+        for account in self.candidates(channel):
+            if not account.is_cooling_down():
+                return account
+        return None
+
+    def seconds_until_available(self) -> float:
+        return max(0.0, min(account.cooldown_until for account in self.accounts) - time.monotonic())
+
+    def mark_flood_wait(self, account: TelegramAccount, seconds: int):
+        account.flood_waits += 1
+        account.cooldown_until = time.monotonic() + seconds
+        logger.warning(f"[{account.name}] FloodWait for {seconds}s, failing over its channels")
+
+    def record(self, account: TelegramAccount, messages: int):
+        account.channels_scraped += 1
+        account.messages_scraped += messages
+
+    def progress(self) -> Dict[str, Dict[str, int]]:
+        return {
+            account.name: {
+                'channels': account.channels_scraped,
+                'messages': account.messages_scraped,
+                'flood_waits': account.flood_waits,
+            }
+            for account in self.accounts
+        }
+
+    async def start(self):
+        for account in self.accounts:
+            await account.client.start(phone=account.phone)
+            logger.info(f"[{account.name}] Telegram client connected ({account.session_name}).")
+
+    async def stop(self):
+        for account in self.accounts:
+            await account.client.disconnect()
+        logger.info("Disconnected Telegram clients.")
@@ -3,44 +3,83 @@
 import os
 import sys
 import json
+import time
 import asyncio
-from datetime import datetime
+import statistics
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Iterator, Optional, Dict, List
 from loguru import logger
-from telethon import TelegramClient
+from telethon import events
+from telethon.errors import FloodWaitError
+from telethon.tl.functions.channels import JoinChannelRequest
 from telethon.tl.types import MessageMediaPhoto
-from dotenv import load_dotenv
+from session_pool import SessionPool, TelegramAccount
+from adaptive_scheduler import AdaptiveScheduler
+from src.settings import get_settings
+
+CHANNELS: List[str] = [
+    'CheMed123',
+    'lobelia4cosmetics',
+    'tikvahpharma',
+]
+
+IMAGE_CHANNELS: List[str] = [
+    'CheMed123',
+    'lobelia4cosmetics',
+]
+
+BASE_PATH = Path("data/raw")
+METADATA_PATH = Path("metadata")
+
+
+def build_scheduler(channels: Optional[List[str]] = None) -> AdaptiveScheduler:
+    """
+    Adaptive scheduler over the scraper's metadata and raw data lake. Needs
+    no Telegram credentials or session, so reports can run next to a scrape.
+    """
+    settings = get_settings()
+    METADATA_PATH.mkdir(exist_ok=True)
+    return AdaptiveScheduler(
+        channels=channels or CHANNELS,
+        metadata_path=METADATA_PATH,
+        messages_dir=BASE_PATH / "telegram_messages",
+        daily_request_budget=settings.scrape_daily_request_budget,
+        min_interval_minutes=settings.scrape_min_interval_minutes,
+        max_interval_hours=settings.scrape_max_interval_hours,
+    )
 
 
 class TelegramScraper:
-    def __init__(self):
-        load_dotenv()
-        self.api_id: int = int(os.getenv('TELEGRAM_API_ID'))
-        self.api_hash: str = os.getenv('TELEGRAM_API_HASH')
-        self.phone: Optional[str] = os.getenv('PHONE')
-        self.session_name: str = "scraper_session"
-        self.client = TelegramClient(self.session_name, self.api_id, self.api_hash)
-
-        self.channels: List[str] = [
-            'CheMed123',
-            'lobelia4cosmetics',
-            'tikvahpharma',
-        ]
-
-        self.image_channels: List[str] = [
-            'CheMed123',
-            'lobelia4cosmetics',
-        ]
-
-        self.base_path: Path = Path("data/raw")
-        self.metadata_path: Path = Path("metadata")
+    def __init__(self, session_prefix: str = "scraper_session"):
+        settings = get_settings()
+        # One or more accounts (TELEGRAM_API_ID, TELEGRAM_API_ID_2, ...); channels
+        # are spread across them so throughput scales with the number of accounts.
+        self.pool: SessionPool = SessionPool.from_env(session_prefix)
+        self.client = self.pool.primary.client
+
+        self.channels: List[str] = list(CHANNELS)
+        self.image_channels: List[str] = list(IMAGE_CHANNELS)
+
+        self.base_path: Path = BASE_PATH
+        self.metadata_path: Path = METADATA_PATH
         self.metadata_path.mkdir(exist_ok=True)
 
         # Load or init last scraped timestamps (per channel)
         self.last_scraped_file: Path = self.metadata_path / "last_scraped.json"
         self.last_scraped: Dict[str, str] = self._load_last_scraped()
 
+        # Listener micro-batching: flush after this many messages or seconds
+        self.stream_batch_size: int = settings.stream_batch_size
+        self.stream_flush_seconds: float = settings.stream_flush_seconds
+        self.stream_max_retries: int = 3
+        # Channels whose last scrape stopped on an error, with the error
+        self.failed_channels: Dict[str, str] = {}
+        # Data lake files written by this run; adaptive runs list them for the loader
+        self.written_files: List[str] = []
+        self.scraped_files_manifest: Path = self.metadata_path / "scraped_files.json"
+
         # Setup logger
         logger.remove()
         logger.add(sys.stderr, level="INFO")
@@ -51,17 +90,33 @@ class TelegramScraper:
             try:
                 with open(self.last_scraped_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    logger.info(f"Loaded last scraped metadata: {data}")
+                    logger.debug(f"Loaded last scraped metadata: {data}")
                     return data
             except Exception as e:
                 logger.error(f"Failed to load last scraped file: {e}")
                 return {}
         return {}
 
+    def _merge_last_scraped(self):
+        """
+        Folds high-water marks written by other processes (batch job or listener)
+        into memory, keeping the newest mark per channel.
+        """
+        on_disk = self._load_last_scraped()
+        for channel, iso in on_disk.items():
+            current = self.last_scraped.get(channel)
+            if current is None or datetime.fromisoformat(iso) > datetime.fromisoformat(current):
+                self.last_scraped[channel] = iso
+
     def _save_last_scraped(self):
         try:
-            with open(self.last_scraped_file, 'w', encoding='utf-8') as f:
+            # Merge before writing so a concurrent batch run and listener never
+            # move each other's marks backwards, then swap the file in atomically.
+            self._merge_last_scraped()
+            tmp_file = self.last_scraped_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.last_scraped, f, indent=2)
+            os.replace(tmp_file, self.last_scraped_file)
             logger.info(f"Saved last scraped metadata: {self.last_scraped}")
         except Exception as e:
             logger.error(f"Failed to save last scraped file: {e}")
@@ -93,20 +148,66 @@ class TelegramScraper:
                 msg_data['is_image'] = True
                 msg_data['image_path'] = str(img_path.relative_to(self.base_path))
                 logger.info(f"[{channel}] Saved image {img_path.name}")
+            except FloodWaitError:
+                # Let the pool fail over instead of storing the message without its photo
+                raise
             except Exception as e:
                 logger.error(f"[{channel}] Failed to save image {message.id}: {e}")
 
         return msg_data
 
-    async def scrape_channel(self, channel: str, limit: int = 1000):
+    def _save_channel_messages(self, channel: str, msg_dir: Path, messages: List[Dict]):
+        """
+        Writes scraped messages to the data lake, merging with any file already
+        written for the channel that day, then persists the high-water mark.
+        """
+        if messages:
+            output_path = msg_dir / f"{channel}.json"
+            existing = []
+            if output_path.exists():
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
+            seen = {msg['id'] for msg in messages}
+            merged = [msg for msg in existing if msg['id'] not in seen] + messages
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, ensure_ascii=False, indent=2)
+            if str(output_path.resolve()) not in self.written_files:
+                self.written_files.append(str(output_path.resolve()))
+            logger.success(f"[{channel}] Saved {len(messages)} new messages to {output_path}")
+        else:
+            logger.info(f"[{channel}] No new messages to save.")
+
+        self._save_last_scraped()
+
+    async def scrape_channel(self, channel: str, limit: int = 1000, client=None) -> int:
+        """
+        Scrapes messages newer than the channel's high-water mark.
+
+        Raises FloodWaitError (after saving what was collected) so the session
+        pool can resume the channel from the saved mark on another account.
+
+        Returns:
+            Number of new messages saved
+        """
+        client = client or self.client
         logger.info(f"Starting scrape for channel: {channel}")
 
+        self._merge_last_scraped()
         last_scraped_iso = self.last_scraped.get(channel)
         last_scraped_dt = datetime.fromisoformat(last_scraped_iso) if last_scraped_iso else None
+        newest_dt = last_scraped_dt
         messages = []
+        msg_dir = None
+
+        if last_scraped_dt:
+            # Oldest first from the mark, so `limit` counts the messages posted since it
+            history = client.iter_messages(channel, limit=limit, reverse=True, offset_date=last_scraped_dt)
+        else:
+            # No mark yet: the newest `limit` messages; reverse paging would start at the channel's first post
+            history = client.iter_messages(channel, limit=limit)
 
         try:
-            async for message in self.client.iter_messages(channel, limit=limit, reverse=True):
+            async for message in history:
                 if message.date is None:
                     continue
 
@@ -120,35 +221,339 @@ class TelegramScraper:
                 msg_data = await self._process_message(message, channel, img_dir)
                 messages.append(msg_data)
 
-                # Update last scraped time
-                if (not last_scraped_dt) or (message.date > last_scraped_dt):
-                    last_scraped_dt = message.date
-                    self.last_scraped[channel] = last_scraped_dt.isoformat()
+                if newest_dt is None or message.date > newest_dt:
+                    newest_dt = message.date
+                if last_scraped_dt:
+                    # Paging forward, so everything up to this message is saved
+                    self.last_scraped[channel] = newest_dt.isoformat()
 
                 await asyncio.sleep(0.2)  # rate limit
 
-            # Save messages JSON if we scraped any new messages
-            if messages:
-                output_path = msg_dir / f"{channel}.json"
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(messages, f, ensure_ascii=False, indent=2)
-                logger.success(f"[{channel}] Saved {len(messages)} new messages to {output_path}")
+        except FloodWaitError:
+            self._save_channel_messages(channel, msg_dir, messages)
+            raise
+        except Exception as e:
+            logger.error(f"Failed to scrape channel {channel}: {e}")
+            self.failed_channels[channel] = str(e)
+        else:
+            self.failed_channels.pop(channel, None)
+            if newest_dt is not None:
+                # Newest-first pages only cover the window once complete
+                self.last_scraped[channel] = newest_dt.isoformat()
+
+        # Save even after a failure; the in-memory mark only covers messages already collected
+        self._save_channel_messages(channel, msg_dir, messages)
+        return len(messages)
+
+    async def _scrape_with_failover(self, channel: str, limit: int = 1000) -> int:
+        """
+        Scrapes a channel on its consistent-hash owner, failing over along the
+        ring whenever the current account is cooling down after a FloodWait.
+
+        Returns:
+            Number of new messages saved
+        """
+        while True:
+            account: Optional[TelegramAccount] = self.pool.available(channel)
+            if account is None:
+                wait = self.pool.seconds_until_available()
+                logger.warning(f"[{channel}] All accounts cooling down, waiting {wait:.0f}s")
+                await asyncio.sleep(wait)
+                continue
+
+            async with account.lock:
+                if account.is_cooling_down():
+                    continue  # flooded while this channel was queued behind it
+                try:
+                    count = await self.scrape_channel(channel, limit, client=account.client)
+                except FloodWaitError as e:
+                    self.pool.mark_flood_wait(account, e.seconds)
+                    continue
+                self.pool.record(account, count)
+                logger.info(f"[{channel}] Done on {account.name}. Progress: {self.pool.progress()}")
+                await asyncio.sleep(5)  # avoid rate limits
+                return count
+
+    async def _scrape_channels(self, channels: List[str], limit: int = 1000,
+                               limits: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        # Accounts work in parallel; each account handles one channel at a time
+        limits = limits or {}
+        counts = await asyncio.gather(*(
+            self._scrape_with_failover(channel, limits.get(channel, limit)) for channel in channels
+        ))
+        return dict(zip(channels, counts))
+
+    @contextmanager
+    def _run_lock(self, wait: bool) -> Iterator[bool]:
+        """
+        Exclusive lock for batch scraping runs, which share the scraper_session
+        files and the schedule state. Yields False if `wait` is off and
+        another run holds the lock.
+        """
+        with open(self.metadata_path / "scraper.lock", 'a+') as lock_file:
+            if sys.platform == "win32":
+                import msvcrt
+                while True:
+                    try:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not wait:
+                            yield False
+                            return
+                        time.sleep(1)
+                try:
+                    yield True
+                finally:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
             else:
-                logger.info(f"[{channel}] No new messages to save.")
+                import fcntl
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-            self._save_last_scraped()
+    async def scrape_all(self, limit: int = 1000):
+        with self._run_lock(wait=True):
+            logger.info(f"Connecting to Telegram with {len(self.pool.accounts)} account(s)...")
+            await self.pool.start()
 
-        except Exception as e:
-            logger.error(f"Failed to scrape channel {channel}: {e}")
+            try:
+                counts = await self._scrape_channels(self.channels, limit=limit)
+            finally:
+                await self.pool.stop()
+
+            # Full runs are observations too, so the adaptive schedule keeps learning
+            scheduler = self.build_scheduler()
+            for channel, count in counts.items():
+                scheduler.observe(channel, count, limit)
+            scheduler.save()
+
+        progress = self.pool.progress()
+        total = sum(stats['messages'] for stats in progress.values())
+        logger.success(f"Scraped {total} new messages across {len(self.channels)} channels: {progress}")
+
+    def build_scheduler(self) -> AdaptiveScheduler:
+        return build_scheduler(self.channels)
 
-    async def scrape_all(self):
-        logger.info("Connecting to Telegram...")
-        await self.client.start(phone=self.phone)
-        logger.info("Telegram client connected.")
+    async def scrape_due(self):
+        """
+        Scrapes only the channels the adaptive scheduler says are due, each
+        with its own message limit, and feeds the results back into it.
+        Skips the tick if another scraping run is still in progress.
+        """
+        with self._run_lock(wait=False) as acquired:
+            if not acquired:
+                logger.info("Another scraping run is in progress, skipping this tick.")
+                return
 
+            scheduler = self.build_scheduler()
+            due = scheduler.due_channels()
+            if not due:
+                logger.info("No channels due for scraping.")
+                self._save_scraped_files_manifest()
+                return
+
+            logger.info(f"Channels due: {due}")
+            limits = dict(due)
+            await self.pool.start()
+            try:
+                counts = await self._scrape_channels(list(limits), limits=limits)
+            finally:
+                await self.pool.stop()
+                self._save_scraped_files_manifest()
+
+            for channel, count in counts.items():
+                scheduler.observe(channel, count, limits[channel])
+            scheduler.save()
+            logger.success(f"Adaptive scrape saved {sum(counts.values())} new messages: {counts}")
+
+    def _save_scraped_files_manifest(self):
+        """
+        Lists the files this run wrote, so `load_to_postgres.py --manifest`
+        loads just those instead of the whole data lake.
+        """
+        tmp_file = self.scraped_files_manifest.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.written_files, f, indent=2)
+        os.replace(tmp_file, self.scraped_files_manifest)
+
+    def _channel_for_chat(self, chat) -> Optional[str]:
+        username = (getattr(chat, 'username', None) or '').lower()
+        for channel in self.channels:
+            if channel.lower() == username:
+                return channel
+        return None
+
+    async def _flush_stream_batch(self, conn, batch: List) -> None:
+        """
+        Writes one micro-batch of live messages: images into the image
+        pipeline's directory layout, rows into Postgres, a JSON file into the
+        raw data lake, and finally the advanced high-water marks.
+        """
+        from src.db.load_to_postgres import insert_messages
+
+        messages = []
+        lake_batches: Dict[tuple, List[Dict]] = {}
+        for message, channel, received_at in batch:
+            last_scraped_iso = self.last_scraped.get(channel)
+            if last_scraped_iso and message.date <= datetime.fromisoformat(last_scraped_iso):
+                continue  # already ingested by the batch backfill
+
+            date_str = message.date.strftime('%Y-%m-%d')
+            msg_dir, img_dir = await self._ensure_directories(channel, date_str)
+            msg_data = await self._process_message(message, channel, img_dir)
+            messages.append((message, channel, received_at, msg_data))
+            lake_batches.setdefault((msg_dir, channel), []).append(msg_data)
+
+        if not messages:
+            return
+
+        with conn.cursor() as cur:
+            insert_messages(cur, [msg_data for _, _, _, msg_data in messages])
+
+        # Separate files per flush so the daily batch file for the channel is never overwritten
+        flush_suffix = datetime.now(timezone.utc).strftime('%H%M%S%f')
+        for (msg_dir, channel), channel_messages in lake_batches.items():
+            output_path = msg_dir / f"{channel}_stream_{flush_suffix}.json"
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(channel_messages, f, ensure_ascii=False, indent=2)
+
+        for message, channel, _, _ in messages:
+            last_scraped_iso = self.last_scraped.get(channel)
+            if not last_scraped_iso or message.date > datetime.fromisoformat(last_scraped_iso):
+                self.last_scraped[channel] = message.date.isoformat()
+        self._save_last_scraped()
+
+        committed_at = time.time()
+        end_to_end = sorted(committed_at - message.date.timestamp() for message, _, _, _ in messages)
+        in_process = [committed_at - received_at for _, _, received_at, _ in messages]
+        p95 = end_to_end[min(len(end_to_end) - 1, int(len(end_to_end) * 0.95))]
+        logger.success(
+            f"Streamed {len(messages)} messages | end-to-end latency "
+            f"p50={statistics.median(end_to_end):.1f}s p95={p95:.1f}s max={end_to_end[-1]:.1f}s | "
+            f"in-process p50={statistics.median(in_process):.2f}s"
+        )
+
+    async def _join_channels(self):
+        """
+        NewMessage events only arrive for channels the account has joined, so
+        the listener joins every configured channel (a no-op if already a member).
+        """
         for channel in self.channels:
-            await self.scrape_channel(channel)
-            await asyncio.sleep(5)  # avoid rate limits
+            try:
+                await self.client(JoinChannelRequest(channel))
+            except Exception as e:
+                logger.warning(f"Could not join {channel}, live messages from it will be missed: {e}")
+
+    async def _catch_up(self, limit: int = 1000):
+        """
+        Backfills every channel up to now, repeating while a scrape fills its
+        whole limit. Streamed messages move the shared marks, so streaming
+        must not start until the backfill has reached the present.
+
+        Raises RuntimeError if a channel could not be scraped, since the
+        marks would otherwise skip its unscraped messages.
+        """
+        pending = list(self.channels)
+        while pending:
+            counts = await self._scrape_channels(pending, limit=limit)
+            failed = {channel: self.failed_channels[channel] for channel in pending if channel in self.failed_channels}
+            if failed:
+                raise RuntimeError(f"Catch-up scrape failed, not streaming: {failed}")
+            pending = [channel for channel, count in counts.items() if count >= limit]
+            if pending:
+                logger.info(f"Catch-up hit the {limit} message limit for {pending}, continuing")
+
+    async def listen(self):
+        """
+        Long-running mode: subscribes to new-message events for the configured
+        channels and micro-batches them into Postgres by size and time.
 
-        await self.client.disconnect()
-        logger.info("Disconnected Telegram client.")
+        The event handler is registered before a catch-up scrape that runs
+        until every channel is backfilled to the present, so no message posted
+        during startup is missed and streaming never moves a mark past
+        unscraped messages in the marks shared with the batch jobs. A batch that still
+        fails after `stream_max_retries` flushes stops the listener without
+        advancing the marks, so the catch-up scrape on restart fills the gap.
+        """
+        import psycopg2
+        from src.db.load_to_postgres import connect_db, ensure_schema
+
+        logger.info(f"Connecting to Telegram with {len(self.pool.accounts)} account(s)...")
+        await self.pool.start()
+        await self._join_channels()
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        @self.client.on(events.NewMessage(chats=self.channels))
+        async def on_new_message(event):
+            channel = self._channel_for_chat(await event.get_chat())
+            if channel and event.message.date is not None:
+                await queue.put((event.message, channel, time.time()))
+
+        try:
+            await self._catch_up()
+        except Exception:
+            # Queued events must not be flushed: they would move the marks past the gap
+            await self.pool.stop()
+            raise
+
+        conn = None
+        logger.info(
+            f"Listening on {len(self.channels)} channels "
+            f"(batch size {self.stream_batch_size}, flush every {self.stream_flush_seconds}s)"
+        )
+        batch = []
+        failed_flushes = 0
+        try:
+            while True:
+                deadline = time.monotonic() + self.stream_flush_seconds
+                while len(batch) < self.stream_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                if batch:
+                    try:
+                        if conn is None or conn.closed:
+                            conn = connect_db()
+                            ensure_schema(conn)
+                        await self._flush_stream_batch(conn, batch)
+                        batch, failed_flushes = [], 0
+                    except Exception as e:
+                        # Keep the batch and retry on the next cycle; writes are idempotent.
+                        failed_flushes += 1
+                        logger.error(f"Failed to flush stream batch of {len(batch)} messages: {e}")
+                        if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)) and conn is not None:
+                            conn.close()  # reconnect on the next attempt, e.g. after a Postgres restart
+                        if failed_flushes >= self.stream_max_retries:
+                            pending = [f"{channel}/{message.id}" for message, channel, _ in batch]
+                            raise RuntimeError(
+                                f"Stream batch failed {failed_flushes} times, stopping so the catch-up "
+                                f"scrape on restart recovers it: {pending}"
+                            ) from e
+        finally:
+            # The leftover batch is flushed as one unit, so marks only move if all of it is written
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                try:
+                    if conn is None or conn.closed:
+                        conn = connect_db()
+                    await self._flush_stream_batch(conn, batch)
+                except Exception as e:
+                    logger.error(f"Final flush of {len(batch)} messages failed; marks left unchanged: {e}")
+            if conn is not None:
+                conn.close()
+            await self.pool.stop()
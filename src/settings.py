@@ -0,0 +1,96 @@
+# src/settings.py
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class Settings:
+    """
+    Pipeline configuration, read from the environment and the project's .env
+    file. Variables already set in the environment (e.g. by Dagster or Docker)
+    take precedence over .env values.
+    """
+
+    def __init__(self):
+        load_dotenv(PROJECT_ROOT / '.env')
+
+        # PostgreSQL
+        self.pg_host: Optional[str] = os.getenv('PGHOST')
+        self.pg_port: Optional[str] = os.getenv('PGPORT')
+        self.pg_database: Optional[str] = os.getenv('PGDATABASE')
+        self.pg_user: Optional[str] = os.getenv('PGUSER')
+        self.pg_password: Optional[str] = os.getenv('PGPASSWORD')
+
+        # Schema dbt builds the marts in: the profile's schema plus the models'
+        # +schema, i.e. public_public with the project's defaults
+        self.dbt_schema: str = os.getenv('DBT_SCHEMA', 'public_public')
+
+        # Raw data lake
+        self.raw_data_dir: Path = Path(os.getenv('RAW_DATA_DIR', 'data/raw/telegram_messages'))
+
+        # Scraper
+        self.flood_sleep_threshold: int = int(os.getenv('TELEGRAM_FLOOD_SLEEP_THRESHOLD', '10'))
+        self.stream_batch_size: int = int(os.getenv('STREAM_BATCH_SIZE', '50'))
+        self.stream_flush_seconds: float = float(os.getenv('STREAM_FLUSH_SECONDS', '5'))
+
+        # Adaptive scraping schedule
+        self.scrape_daily_request_budget: int = int(os.getenv('SCRAPE_DAILY_REQUEST_BUDGET', '2000'))
+        self.scrape_min_interval_minutes: int = int(os.getenv('SCRAPE_MIN_INTERVAL_MINUTES', '15'))
+        self.scrape_max_interval_hours: int = int(os.getenv('SCRAPE_MAX_INTERVAL_HOURS', '24'))
+
+        # Product extraction
+        self.product_dictionary_path: Path = Path(os.getenv(
+            'PRODUCT_DICTIONARY_PATH',
+            str(PROJECT_ROOT / 'src' / 'product_extractor' / 'products.txt'),
+        ))
+        self.product_extraction_batch_size: int = int(os.getenv('PRODUCT_EXTRACTION_BATCH_SIZE', '2000'))
+        self.product_extraction_workers: int = int(os.getenv('PRODUCT_EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+
+        # Image cache
+        self.image_cache_dir: str = os.getenv('IMAGE_CACHE_DIR', 'data/cache/images')
+        self.image_cache_max_mb: int = int(os.getenv('IMAGE_CACHE_MAX_MB', '512'))
+        self.image_cache_size: int = int(os.getenv('IMAGE_CACHE_SIZE', '640'))  # YOLOv8 input size
+
+    @property
+    def telegram_accounts(self) -> List[Dict[str, Any]]:
+        """
+        Telegram accounts: TELEGRAM_API_ID / TELEGRAM_API_HASH / PHONE for the
+        primary account, the same variables suffixed _2, _3, ... for the others.
+        Parsed on access, so only the scraper needs valid credentials.
+        """
+        accounts = []
+        index = 1
+        while True:
+            suffix = '' if index == 1 else f'_{index}'
+            api_id = os.getenv(f'TELEGRAM_API_ID{suffix}')
+            if not api_id:
+                return accounts
+            accounts.append({
+                "suffix": suffix,
+                "api_id": int(api_id),
+                "api_hash": os.getenv(f'TELEGRAM_API_HASH{suffix}'),
+                "phone": os.getenv(f'PHONE{suffix}'),
+            })
+            index += 1
+
+    @property
+    def db_config(self) -> Dict[str, Any]:
+        """Keyword arguments for psycopg2.connect."""
+        return {
+            "host": self.pg_host,
+            "port": self.pg_port,
+            "dbname": self.pg_database,
+            "user": self.pg_user,
+            "password": self.pg_password,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Loads settings once per process."""
+    return Settings()
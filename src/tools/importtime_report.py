@@ -0,0 +1,110 @@
+# src/tools/importtime_report.py
+"""
+Import-time profile of the pipeline entry points, based on `python -X importtime`.
+
+Each entry point is imported in a fresh interpreter. The report lists the
+slowest imports, and the script exits non-zero if an entry point is over its
+startup budget or pulls in a heavy library it should only import lazily.
+
+Run from the project root:
+    python -m src.tools.importtime_report
+
+The same budgets are enforced by tests/tools/test_importtime.py.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# module -> (startup budget in ms, heavy top-level packages it must not import)
+ENTRY_POINTS: Dict[str, Tuple[int, List[str]]] = {
+    "src.api.main": (1500, ["sqlalchemy", "torch", "ultralytics", "cv2", "pandas", "dagster"]),
+    "src.yolov8_detector.detector": (200, ["torch", "ultralytics", "cv2"]),
+    "src.settings": (200, ["psycopg2", "telethon", "torch", "sqlalchemy"]),
+    # Started by the Dagster scrape ops; Postgres is only needed in --listen mode
+    "telegram_scraper": (800, ["psycopg2", "torch", "ultralytics", "sqlalchemy", "pandas", "dagster"]),
+}
+
+# Entry points run as scripts import their siblings by bare name, so their
+# directory goes on the path next to the project root.
+SCRIPT_DIRS: Dict[str, Path] = {
+    "telegram_scraper": PROJECT_ROOT / "src" / "scraper",
+}
+
+
+def profile_import(module: str) -> List[Tuple[int, int, str]]:
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+
+    Returns:
+        List of tuples: (self_us, cumulative_us, imported_module)
+    """
+    paths = [str(PROJECT_ROOT)]
+    if module in SCRIPT_DIRS:
+        paths.append(str(SCRIPT_DIRS[module]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(paths)},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time:   self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def check_entry_point(module: str, budget_ms: int, forbidden: List[str], top: int) -> List[str]:
+    rows = profile_import(module)
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    imported = {name for _, _, name in rows}
+
+    print(f"\n{module}: {total_ms:.0f} ms (budget {budget_ms} ms), {len(rows)} modules")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms cumulative  {self_us / 1000:7.1f} ms self  {name}")
+
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"{module} takes {total_ms:.0f} ms to import, budget is {budget_ms} ms")
+    for package in forbidden:
+        if package in imported:
+            failures.append(f"{module} imports {package} at module load; import it lazily")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="Entry points to profile (default: all)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list per entry point")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. for slow CI runners")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules or ENTRY_POINTS:
+        budget_ms, forbidden = ENTRY_POINTS.get(module, (1000, []))
+        failures += check_entry_point(module, int(budget_ms * args.budget_scale), forbidden, args.top)
+
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll entry points within their startup budget.")
+
+
+if __name__ == "__main__":
+    main()
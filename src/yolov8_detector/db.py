@@ -1,44 +1,81 @@
 # src/yolov8_detector/db.py
-import os
 import logging
 import psycopg2
 from psycopg2.extras import execute_values
-from typing import List, Tuple
+from typing import List, Set, Tuple
+from src.settings import get_settings
 
-DB_HOST = os.getenv('PGHOST')
-DB_PORT = os.getenv('PGPORT')
-DB_NAME = os.getenv('PGDATABASE')
-DB_USER = os.getenv('PGUSER')
-DB_PASSWORD = os.getenv('PGPASSWORD')
+# Telegram message ids are only unique within a channel, so detections are
+# keyed on (channel, message_id). image_detection_log records every processed
+# image, including those with no detections, so images are never re-run.
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS fct_image_detections (
+        message_id BIGINT NOT NULL,
+        detected_object_class TEXT NOT NULL,
+        confidence_score DOUBLE PRECISION NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    ALTER TABLE fct_image_detections ADD COLUMN IF NOT EXISTS channel TEXT;
+    ALTER TABLE fct_image_detections ADD COLUMN IF NOT EXISTS image_path TEXT;
+    CREATE INDEX IF NOT EXISTS idx_image_detections_channel_message
+        ON fct_image_detections (channel, message_id);
+    CREATE INDEX IF NOT EXISTS idx_image_detections_class_channel
+        ON fct_image_detections (detected_object_class, channel);
+
+    CREATE TABLE IF NOT EXISTS image_detection_log (
+        channel TEXT NOT NULL,
+        message_id BIGINT NOT NULL,
+        image_path TEXT NOT NULL,
+        object_count INTEGER NOT NULL,
+        processed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (channel, message_id)
+    );
+
+"""
 
 def get_db_connection():
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD
-        )
+        conn = psycopg2.connect(**get_settings().db_config)
         logging.info("Connected to database")
         return conn
     except Exception as e:
         logging.error(f"DB connection error: {e}")
         raise
 
-def save_detections(conn, message_id: int, detections: List[Tuple[str, float]]):
-    if not detections:
-        return
+def ensure_schema(conn):
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_SQL)
+    conn.commit()
+
+def get_processed_images(conn) -> Set[Tuple[str, int]]:
+    """(channel, message_id) keys of images that already went through detection."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT channel, message_id FROM image_detection_log")
+        return set(cur.fetchall())
+
+def save_detections(conn, channel: str, message_id: int, image_path: str,
+                    detections: List[Tuple[str, float]]):
+    """Saves an image's detections and marks it processed in one transaction."""
     try:
         with conn.cursor() as cur:
-            records = [(message_id, cls, conf) for cls, conf in detections]
-            query = """
-                INSERT INTO fct_image_detections (message_id, detected_object_class, confidence_score)
-                VALUES %s
-            """
-            execute_values(cur, query, records)
+            if detections:
+                records = [(channel, message_id, image_path, cls, conf) for cls, conf in detections]
+                query = """
+                    INSERT INTO fct_image_detections (
+                        channel, message_id, image_path, detected_object_class, confidence_score
+                    ) VALUES %s
+                """
+                execute_values(cur, query, records)
+            cur.execute(
+                """
+                INSERT INTO image_detection_log (channel, message_id, image_path, object_count)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (channel, message_id) DO NOTHING
+                """,
+                (channel, message_id, image_path, len(detections)),
+            )
         conn.commit()
-        logging.info(f"Saved {len(detections)} detections for message_id {message_id}")
+        logging.info(f"Saved {len(detections)} detections for {channel}/{message_id}")
     except Exception as e:
         logging.error(f"Error saving detections: {e}")
         conn.rollback()
@@ -1,33 +1,41 @@
 # src/yolov8_detector/detector.py
 
 import logging
-from typing import List, Tuple
-from ultralytics import YOLO
+from typing import List, Optional, Tuple
 
 class YOLOv8Detector:
     """
     YOLOv8 object detection wrapper class.
     Loads the model and runs detection on images.
+    When an ImageCache is given, detection runs on its decoded thumbnails
+    instead of re-decoding full-resolution photos.
     """
 
-    def __init__(self, model_path: str = 'yolov8n.pt'):
+    def __init__(self, model_path: str = 'yolov8n.pt', image_cache=None):
         self.model_path = model_path
+        self.image_cache = image_cache
         try:
+            # Imported here so importing this module doesn't pull in torch
+            from ultralytics import YOLO
             self.model = YOLO(self.model_path)
             logging.info(f"Loaded YOLOv8 model from {self.model_path}")
         except Exception as e:
             logging.error(f"Error loading YOLOv8 model: {e}")
             raise
 
-    def detect(self, image_path: str) -> List[Tuple[str, float]]:
+    def detect(self, image_path: str) -> Optional[List[Tuple[str, float]]]:
         """
         Run detection on an image.
 
         Returns:
-            List of tuples: (detected_class_name, confidence_score)
+            List of tuples: (detected_class_name, confidence_score),
+            or None if the image could not be processed
         """
         try:
-            results = self.model(image_path)
+            source = image_path
+            if self.image_cache is not None:
+                _, source = self.image_cache.load(image_path)
+            results = self.model(source)
             detections = []
             for result in results:
                 for box in result.boxes:
@@ -37,4 +45,4 @@ class YOLOv8Detector:
             return detections
         except Exception as e:
             logging.error(f"Error during detection on {image_path}: {e}")
-            return []
+            return None
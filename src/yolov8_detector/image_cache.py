@@ -0,0 +1,160 @@
+# src/yolov8_detector/image_cache.py
+
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Tuple
+from PIL import Image, ImageOps
+
+EXIF_ORIENTATION = 0x0112
+EXIF_DATETIME = 0x0132  # last modified; fallback when the capture time is missing
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+
+
+class ImageCache:
+    """
+    Decode-once cache of model-input-sized thumbnails.
+
+    Each source photo is decoded a single time (JPEGs via draft mode, which
+    lets libjpeg downscale during decoding instead of materialising the full
+    resolution image), EXIF-rotated, shrunk to `target_size` and stored with
+    its metadata. The cache is bounded by total thumbnail bytes and evicts
+    least recently used entries first. The index is saved every `save_every`
+    misses, and thumbnails missing from it (e.g. after a crash) are removed
+    on load so they never escape the size bound.
+    """
+
+    def __init__(self, cache_dir: str = 'data/cache/images', max_bytes: int = 512 * 1024 * 1024,
+                 target_size: int = 640, save_every: int = 50):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.target_size = target_size
+        self.save_every = save_every
+        self.index_file = self.cache_dir / 'index.json'
+        self.entries: "OrderedDict[str, Dict]" = self._load_index()
+        self._remove_orphans()
+        self.total_bytes = sum(entry['bytes'] for entry in self.entries.values())
+        self.hits = 0
+        self.misses = 0
+
+    def _load_index(self) -> "OrderedDict[str, Dict]":
+        if not self.index_file.exists():
+            return OrderedDict()
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f, object_pairs_hook=OrderedDict)
+        except Exception as e:
+            logging.error(f"Failed to load image cache index, starting empty: {e}")
+            return OrderedDict()
+        # Drop entries whose thumbnails were removed outside the cache
+        return OrderedDict(
+            (key, entry) for key, entry in entries.items()
+            if (self.cache_dir / entry['thumbnail']).exists()
+        )
+
+    def _remove_orphans(self):
+        """Deletes thumbnails written after the last index save."""
+        indexed = {entry['thumbnail'] for entry in self.entries.values()}
+        removed = 0
+        for path in self.cache_dir.glob('*/*.jpg'):
+            if path.relative_to(self.cache_dir).as_posix() not in indexed:
+                path.unlink()
+                removed += 1
+        if removed:
+            logging.warning(f"Removed {removed} unindexed thumbnails from the image cache")
+
+    def save(self):
+        """Persists the index (in LRU order) so the cache survives across runs."""
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_file, self.index_file)
+        logging.info(
+            f"Image cache: {len(self.entries)} entries, {self.total_bytes / 1e6:.1f} MB, "
+            f"{self.hits} hits, {self.misses} misses"
+        )
+
+    @staticmethod
+    def _key(image_path: str) -> str:
+        # Path plus size and mtime, so a re-downloaded photo is never served stale
+        stat = os.stat(image_path)
+        raw = f"{os.path.abspath(image_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def thumbnail_path(self, entry: Dict) -> Path:
+        return self.cache_dir / entry['thumbnail']
+
+    def get(self, image_path: str) -> Dict:
+        """
+        Returns the cache entry for `image_path`, decoding the photo on a miss.
+
+        Returns:
+            Dict with the thumbnail file name (relative to the cache dir),
+            thumbnail and original dimensions, EXIF orientation and capture time.
+        """
+        return self.load(image_path)[0]
+
+    def load(self, image_path: str) -> Tuple[Dict, Image.Image]:
+        """
+        Returns the cache entry and the RGB thumbnail for `image_path`. A miss
+        hands back the thumbnail just decoded, so the photo is decoded once;
+        only hits read the cached JPEG.
+        """
+        key = self._key(image_path)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            with Image.open(self.thumbnail_path(entry)) as img:
+                return entry, img.convert('RGB')
+
+        self.misses += 1
+        entry, img = self._build(image_path, key)
+        self.entries[key] = entry
+        self.total_bytes += entry['bytes']
+        self._evict()
+        if self.misses % self.save_every == 0:
+            self.save()
+        return entry, img
+
+    def _build(self, image_path: str, key: str) -> Tuple[Dict, Image.Image]:
+        with Image.open(image_path) as img:
+            original_size = img.size
+            exif = img.getexif()
+            orientation = exif.get(EXIF_ORIENTATION, 1)
+            taken_at = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+            # JPEG only: decode at the smallest DCT scale still >= target size
+            img.draft('RGB', (self.target_size, self.target_size))
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            img.thumbnail((self.target_size, self.target_size))
+
+            thumbnail = f"{key[:2]}/{key}.jpg"
+            path = self.cache_dir / thumbnail
+            path.parent.mkdir(exist_ok=True)
+            img.save(path, 'JPEG', quality=90)
+
+        return {
+            'source': str(image_path),
+            'thumbnail': thumbnail,
+            'width': img.width,
+            'height': img.height,
+            'original_width': original_size[0],
+            'original_height': original_size[1],
+            'orientation': orientation,
+            'taken_at': taken_at,
+            'bytes': path.stat().st_size,
+        }, img
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry['bytes']
+            try:
+                self.thumbnail_path(entry).unlink()
+            except FileNotFoundError:
+                pass
@@ -1,9 +1,17 @@
 -- models/marts/fct_image_detections.sql
+{{ config(
+    materialized='table',
+    indexes=[
+        {'columns': ['channel_key', 'message_id']},
+        {'columns': ['detected_object_class', 'channel_key']},
+    ]
+) }}
+
 SELECT
+    channel_key,
     message_id,
+    image_path,
     detected_object_class,
     confidence_score,
     created_at
-FROM {{ source('telegram_source', 'fct_image_detections') }}
-
-
+FROM {{ ref('stg_image_detections') }}
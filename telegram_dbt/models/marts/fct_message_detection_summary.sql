@@ -0,0 +1,55 @@
+-- models/marts/fct_message_detection_summary.sql
+-- One row per processed image/message, including images with no detections.
+{{ config(
+    materialized='table',
+    indexes=[
+        {'columns': ['channel_key', 'message_id'], 'unique': True},
+        {'columns': ['has_product', 'channel_key']},
+        {'columns': ['has_person', 'channel_key']},
+    ]
+) }}
+
+with processed_images as (
+    select
+        channel as channel_key,
+        message_id,
+        image_path,
+        processed_at
+    from {{ source('telegram_source', 'image_detection_log') }}
+),
+
+detection_counts as (
+    select
+        channel_key,
+        message_id,
+        count(*) as object_count,
+        count(distinct detected_object_class) as distinct_class_count,
+        max(confidence_score) as max_confidence,
+        bool_or(detected_object_class = 'person') as has_person,
+        bool_or(detected_object_class in (
+            {%- for object_class in var('product_object_classes') -%}
+            '{{ object_class }}'{% if not loop.last %}, {% endif %}
+            {%- endfor -%}
+        )) as has_product
+    from {{ ref('stg_image_detections') }}
+    group by channel_key, message_id
+)
+
+select
+    p.channel_key,
+    p.message_id,
+    cast(m.date as date) as date_key,
+    p.image_path,
+    coalesce(d.object_count, 0) as object_count,
+    coalesce(d.distinct_class_count, 0) as distinct_class_count,
+    d.max_confidence,
+    coalesce(d.has_person, false) as has_person,
+    coalesce(d.has_product, false) as has_product,
+    p.processed_at
+from processed_images p
+left join detection_counts d
+    on d.channel_key = p.channel_key
+    and d.message_id = p.message_id
+left join {{ source('telegram_source', 'telegram_messages') }} m
+    on m.channel = p.channel_key
+    and m.id = p.message_id
@@ -0,0 +1,14 @@
+-- models/marts/fct_product_mentions.sql
+{{ config(materialized='table') }}
+
+SELECT
+    message_id,
+    channel AS channel_key,
+    CAST(message_date AS date) AS date_key,
+    product_name,
+    matched_text,
+    dosage_value,
+    dosage_unit,
+    price_etb,
+    created_at
+FROM {{ source('telegram_source', 'fct_product_mentions') }}
@@ -1,14 +1,14 @@
 -- models/staging/stg_image_detections.sql
 
--- models/staging/stg_image_detections.sql
-
 {{ config(
     materialized='table'
 ) }}
 
 with source as (
     select
+        channel,
         message_id,
+        image_path,
         detected_object_class,
         confidence_score,
         created_at
@@ -17,11 +17,14 @@ with source as (
 
 renamed as (
     select
+        channel as channel_key,
         message_id,
+        image_path,
         detected_object_class,
         confidence_score,
         created_at
     from source
+    where channel is not null
 )
 
 select * from renamed
@@ -0,0 +1,5 @@
+-- Each (channel_key, message_id) must appear once in the detection summary
+SELECT channel_key, message_id, COUNT(*) AS row_count
+FROM {{ ref('fct_message_detection_summary') }}
+GROUP BY channel_key, message_id
+HAVING COUNT(*) > 1
@@ -0,0 +1,5 @@
+-- Message ids are only unique per channel: each (channel_key, message_id) must appear once
+SELECT channel_key, message_id, COUNT(*) AS row_count
+FROM {{ ref('fct_messages') }}
+GROUP BY channel_key, message_id
+HAVING COUNT(*) > 1
@@ -0,0 +1,32 @@
+from src.product_extractor.normalize import dosage_after, parse_dosage, parse_price, price_on_line
+
+
+def test_parse_price_plain_and_prefixed():
+    assert parse_price("Only 120 birr") == 120.0
+    assert parse_price("ETB 350") == 350.0
+    assert parse_price("Br. 45.5 each") == 45.5
+
+
+def test_parse_price_thousands_grouped():
+    assert parse_price("ETB 1,250") == 1250.0
+    assert parse_price("Price 1,200.50 birr") == 1200.5
+    assert parse_price("2 500 ብር") == 2500.0
+
+
+def test_parse_price_none_without_currency():
+    assert parse_price("Amoxicillin 500mg") is None
+
+
+def test_parse_dosage_converts_mass_to_mg():
+    assert parse_dosage("500mg") == (500.0, 'mg')
+    assert parse_dosage("0.5 g") == (500.0, 'mg')
+    assert parse_dosage("250 mcg") == (0.25, 'mg')
+    assert parse_dosage("5 ml syrup") == (5.0, 'ml')
+    assert parse_dosage("no dose here") is None
+
+
+def test_dosage_and_price_are_tied_to_the_mention():
+    text = "Panadol 500mg - 120 birr\nAmoxicillin caps"
+    assert dosage_after(text, len("Panadol")) == (500.0, 'mg')
+    assert price_on_line(text, 0) == 120.0
+    assert price_on_line(text, text.index("Amoxicillin")) is None
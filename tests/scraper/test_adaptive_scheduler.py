@@ -0,0 +1,106 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.scraper.adaptive_scheduler import MAX_LIMIT, MIN_LIMIT, AdaptiveScheduler
+
+
+def make_scheduler(tmp_path, rates, budget=2000):
+    lake = tmp_path / "telegram_messages"
+    lake.mkdir()
+    scheduler = AdaptiveScheduler(list(rates), tmp_path, lake, daily_request_budget=budget)
+    for channel, rate in rates.items():
+        scheduler.state[channel]['rate_per_hour'] = rate
+    return scheduler
+
+
+def hours_ago(hours):
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+
+
+def test_plan_fits_budget_and_polls_busy_channels_more_often(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'busy': 50.0, 'hourly': 1.0, 'quiet': 0.05}, budget=300)
+    plan = scheduler.plan()
+
+    assert sum(entry['requests_per_day'] for entry in plan.values()) <= 300
+    assert plan['busy']['interval'] < plan['hourly']['interval'] < plan['quiet']['interval']
+    for entry in plan.values():
+        assert scheduler.min_interval <= entry['interval'] <= scheduler.max_interval
+        assert MIN_LIMIT <= entry['limit'] <= MAX_LIMIT
+        assert entry['limit'] % 100 == 0
+
+
+def test_plan_falls_back_to_max_interval_when_budget_is_too_small(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'a': 500.0, 'b': 200.0}, budget=1)
+    plan = scheduler.plan()
+    assert all(entry['interval'] == scheduler.max_interval for entry in plan.values())
+
+
+def test_observe_updates_moving_average(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'channel': 1.0})
+    scheduler.state['channel']['last_polled_at'] = hours_ago(2)
+
+    scheduler.observe('channel', 10, limit=1000)
+
+    # 5 messages/hour observed, weighted 0.3 against the previous 1.0
+    assert scheduler.rate('channel') == pytest.approx(2.2, rel=1e-2)
+    assert scheduler.state['channel']['polls'] == 1
+    assert scheduler.state['channel']['silent_since'] is None
+
+
+def test_truncated_poll_raises_rate_above_observed(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'channel': 1.0})
+    scheduler.state['channel']['last_polled_at'] = hours_ago(1)
+
+    scheduler.observe('channel', 100, limit=100)
+
+    # The moving average alone would give ~31/h; a full page means at least 1.5x the observed 100/h
+    assert scheduler.rate('channel') == pytest.approx(150, rel=1e-3)
+
+
+def test_back_to_back_polls_leave_rate_unchanged(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'channel': 3.0})
+    scheduler.state['channel']['last_polled_at'] = datetime.now(timezone.utc).isoformat()
+
+    scheduler.observe('channel', 0, limit=100)
+
+    assert scheduler.rate('channel') == 3.0
+
+
+def test_empty_polls_back_off_from_first_silent_poll(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'channel': 1.0})
+    entry = scheduler.state['channel']
+
+    entry['last_polled_at'] = hours_ago(4)
+    scheduler.observe('channel', 0, limit=100)
+    assert scheduler.rate('channel') == pytest.approx(0.25, rel=1e-2)
+    first_silent = entry['silent_since']
+    assert first_silent is not None
+
+    # Second empty poll: silence is measured from the first one, ten hours back
+    entry['silent_since'] = hours_ago(10)
+    entry['last_polled_at'] = hours_ago(4)
+    scheduler.observe('channel', 0, limit=100)
+    assert scheduler.rate('channel') == pytest.approx(0.1, rel=1e-2)
+
+    entry['last_polled_at'] = hours_ago(4)
+    scheduler.observe('channel', 3, limit=100)
+    assert entry['silent_since'] is None
+    assert scheduler.rate('channel') > 0.1
+
+
+def test_rate_ignores_age_of_last_scraped_mark(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'channel': 1.0})
+    with open(tmp_path / "last_scraped.json", 'w', encoding='utf-8') as f:
+        json.dump({'channel': hours_ago(20)}, f)
+
+    assert scheduler.rate('channel') == 1.0
+
+
+def test_never_polled_channels_are_due_busiest_first(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'quiet': 0.1, 'busy': 20.0})
+    scheduler.state['quiet']['last_polled_at'] = None
+    scheduler.state['busy']['last_polled_at'] = None
+
+    assert [channel for channel, _ in scheduler.due_channels()] == ['busy', 'quiet']
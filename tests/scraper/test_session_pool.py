@@ -0,0 +1,71 @@
+import pytest
+
+from src.scraper.session_pool import SessionPool, TelegramAccount
+
+CHANNELS = [f"channel_{i}" for i in range(300)]
+
+
+def make_accounts(tmp_path, count):
+    return [
+        TelegramAccount(
+            name=f"account{index}",
+            api_id=index,
+            api_hash="hash",
+            phone=None,
+            session_name=str(tmp_path / f"session_{index}"),
+            flood_sleep_threshold=10,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def test_pool_needs_an_account():
+    with pytest.raises(ValueError):
+        SessionPool([])
+
+
+def test_channels_are_spread_and_stick_to_their_owner(tmp_path):
+    accounts = make_accounts(tmp_path, 3)
+    pool = SessionPool(accounts)
+    owners = {channel: pool.owner(channel).name for channel in CHANNELS}
+
+    for account in accounts:
+        share = sum(1 for name in owners.values() if name == account.name) / len(CHANNELS)
+        assert 0.15 < share < 0.55
+
+    rebuilt = SessionPool(accounts)
+    assert owners == {channel: rebuilt.owner(channel).name for channel in CHANNELS}
+
+
+def test_adding_an_account_only_moves_channels_to_it(tmp_path):
+    accounts = make_accounts(tmp_path, 4)
+    before = SessionPool(accounts[:3])
+    after = SessionPool(accounts)
+
+    moved = [channel for channel in CHANNELS if before.owner(channel) is not after.owner(channel)]
+    assert all(after.owner(channel) is accounts[3] for channel in moved)
+    assert 0.1 < len(moved) / len(CHANNELS) < 0.4
+
+
+def test_candidates_list_every_account_once_owner_first(tmp_path):
+    accounts = make_accounts(tmp_path, 3)
+    pool = SessionPool(accounts)
+    for channel in CHANNELS[:20]:
+        candidates = pool.candidates(channel)
+        assert candidates[0] is pool.owner(channel)
+        assert sorted(account.name for account in candidates) == ["account1", "account2", "account3"]
+
+
+def test_flood_wait_fails_over_along_the_ring(tmp_path):
+    pool = SessionPool(make_accounts(tmp_path, 2))
+    channel = CHANNELS[0]
+    owner, backup = pool.candidates(channel)
+
+    pool.mark_flood_wait(owner, 60)
+    assert owner.is_cooling_down()
+    assert pool.available(channel) is backup
+
+    pool.mark_flood_wait(backup, 30)
+    assert pool.available(channel) is None
+    assert 0 < pool.seconds_until_available() <= 30
+    assert pool.progress()[owner.name]['flood_waits'] == 1
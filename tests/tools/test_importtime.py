@@ -0,0 +1,23 @@
+import os
+import re
+
+import pytest
+
+from src.tools.importtime_report import ENTRY_POINTS, check_entry_point
+
+# Slow CI runners set IMPORTTIME_BUDGET_SCALE=2
+BUDGET_SCALE = float(os.getenv("IMPORTTIME_BUDGET_SCALE", "1"))
+LOCAL_PACKAGES = {"src", "telegram_scraper", "session_pool", "adaptive_scheduler"}
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_within_startup_budget(module):
+    budget_ms, forbidden = ENTRY_POINTS[module]
+    try:
+        failures = check_entry_point(module, int(budget_ms * BUDGET_SCALE), forbidden, top=10)
+    except RuntimeError as e:
+        missing = re.search(r"No module named '([\w.]+)'", str(e))
+        if missing and missing.group(1).split(".")[0] not in LOCAL_PACKAGES:
+            pytest.skip(f"{module} needs {missing.group(1)}, which is not installed")
+        raise
+    assert not failures, "\n".join(failures)